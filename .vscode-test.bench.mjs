@@ -0,0 +1,16 @@
+import { defineConfig } from '@vscode/test-cli';
+
+export default defineConfig({
+  files: 'out/test/benchmark/**/*.bench.js',
+  workspaceFolder: './src/test/fixtures',
+  mocha: {
+    ui: 'tdd',
+    timeout: 0,
+    color: true
+  },
+  version: 'stable',
+  extensionDevelopmentPath: '.',
+  env: {
+    NODE_ENV: 'test'
+  }
+});
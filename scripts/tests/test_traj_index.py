@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+traj_index.py 的测试
+
+data/ 中的轨迹由 mdtraj (libxdrfile) 写出，坐标由 reference_coords() 给出：
+每 3 个原子为一个水分子式的分组，第 f 帧整体沿 x 平移 0.1f nm；
+时间为 0, 2.5, 5.0 ps，步数为 0, 1250, 2500，box 为 3 nm 立方。
+water12.xtc 为压缩格式（包含小整数游程），water5.xtc 为 9 个原子以下的未压缩格式。
+
+运行: python -m unittest discover scripts/tests
+"""
+
+import os
+import sys
+import shutil
+import struct
+import tempfile
+import unittest
+
+import numpy as np
+
+SCRIPTS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATA_DIR = os.path.join(SCRIPTS_DIR, 'tests', 'data')
+sys.path.insert(0, SCRIPTS_DIR)
+
+import traj_index  # noqa: E402
+
+XTC_TOLERANCE = 0.0005 + 1e-6
+TIMES = [0.0, 2.5, 5.0]
+STEPS = [0, 1250, 2500]
+
+
+def reference_coords(natoms: int, nframes: int = 3) -> np.ndarray:
+    """生成测试数据时使用的坐标 (nframes, natoms, 3)，单位 nm"""
+    offsets = np.array([[0, 0, 0], [0.095, 0.01, 0], [-0.03, 0.09, 0.02]])
+    coords = np.empty((nframes, natoms, 3))
+    for f in range(nframes):
+        for i in range(natoms):
+            coords[f, i] = np.array([0.5 + (i // 3) * 0.7, 1.0, 1.5]) + offsets[i % 3] + [f * 0.1, 0, 0]
+    return coords.astype(np.float32)
+
+
+def data_path(name: str) -> str:
+    return os.path.join(DATA_DIR, name)
+
+
+def write_trr(path: str, frames, double: bool = False):
+    """按 GROMACS 的 TRR 布局写出帧，frames 中每项为 (step, time, box, x, v, f)，不存在的块为 None"""
+    real = '>d' if double else '>f'
+    with open(path, 'wb') as f:
+        for step, time, *blocks in frames:
+            data = [b'' if block is None else np.asarray(block, dtype=real).tobytes() for block in blocks]
+            box, x, v, force = data
+            natoms = next(len(np.asarray(block)) for block in blocks[1:] if block is not None)
+            f.write(struct.pack('>iii12s', 1993, 13, 12, b'GMX_trn_file'))
+            f.write(struct.pack('>13i', 0, 0, len(box), 0, 0, 0, 0,
+                                len(x), len(v), len(force), natoms, step, 0))
+            f.write(struct.pack(real + real[1], time, 0.0))
+            f.write(box + x + v + force)
+
+
+class IndexTest(unittest.TestCase):
+    """帧头扫描"""
+
+    def check_index(self, name: str, natoms: int):
+        path = data_path(name)
+        index = traj_index.build_index(path)
+
+        self.assertEqual(len(index), 3)
+        self.assertEqual(index['natoms'].tolist(), [natoms] * 3)
+        self.assertEqual(index['step'].tolist(), STEPS)
+        np.testing.assert_allclose(index['time'], TIMES)
+        # 帧首尾相接并覆盖整个文件
+        self.assertEqual(index['offset'][0], 0)
+        np.testing.assert_array_equal(index['offset'][1:], (index['offset'] + index['size'])[:-1])
+        self.assertEqual(int(index['offset'][-1] + index['size'][-1]), os.path.getsize(path))
+
+    def test_compressed_xtc(self):
+        self.check_index('water12.xtc', 12)
+
+    def test_uncompressed_xtc(self):
+        self.check_index('water5.xtc', 5)
+
+    def test_trr(self):
+        self.check_index('water12.trr', 12)
+
+    def test_truncated_frame_is_dropped(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'partial.xtc')
+            with open(data_path('water12.xtc'), 'rb') as f:
+                content = f.read()
+            with open(path, 'wb') as f:
+                f.write(content[:-10])
+            self.assertEqual(len(traj_index.build_index(path)), 2)
+
+    def test_velocity_only_frames(self):
+        coords = reference_coords(12)
+        box = np.eye(3) * 3
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'mixed.trr')
+            write_trr(path, [(0, 0.0, box, coords[0], coords[0], None),
+                             (500, 1.0, box, None, coords[1], None),
+                             (1000, 2.0, box, coords[2], None, None)])
+            index = traj_index.build_index(path)
+            self.assertEqual(index['has_coords'].tolist(), [True, False, True])
+            self.assertEqual(int(index['offset'][-1] + index['size'][-1]), os.path.getsize(path))
+
+            stem = os.path.join(tmp, 'out')
+            result = traj_index.export_trajectory(path, stem)
+            self.assertEqual(result['frames'], 2)
+            np.testing.assert_array_equal(np.load(stem + '.npy'), coords[[0, 2]])
+            np.testing.assert_allclose(np.load(stem + '.time.npy'), [0.0, 2.0])
+
+    def test_double_precision_frames_without_box_or_coords(self):
+        coords = reference_coords(12).astype(np.float64)
+        box = np.eye(3) * 3
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'double.trr')
+            write_trr(path, [(0, 0.0, box, coords[0], None, None),
+                             (500, 1.0, None, None, None, coords[1]),
+                             (1000, 2.0, box, coords[2], None, None)], double=True)
+            index = traj_index.build_index(path)
+            np.testing.assert_allclose(index['time'], [0.0, 1.0, 2.0])
+            self.assertEqual(int(index['offset'][-1] + index['size'][-1]), os.path.getsize(path))
+
+
+class ExportTest(unittest.TestCase):
+    """坐标解码与导出"""
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def export(self, name: str, **kwargs) -> np.ndarray:
+        stem = os.path.join(self.tmp, name)
+        traj_index.export_trajectory(data_path(name), stem, rebuild=True, **kwargs)
+        return np.load(stem + '.npy')
+
+    def test_python_decoder_matches_reference(self):
+        for name, natoms, tolerance in (('water12.xtc', 12, XTC_TOLERANCE),
+                                        ('water5.xtc', 5, 0),
+                                        ('water12.trr', 12, 0)):
+            with self.subTest(name=name):
+                coords = self.export(name, backend='python')
+                np.testing.assert_allclose(coords, reference_coords(natoms), atol=tolerance, rtol=0)
+                box = np.load(os.path.join(self.tmp, name + '.box.npy'))
+                np.testing.assert_allclose(box, np.tile(np.eye(3) * 3, (3, 1, 1)))
+
+    @unittest.skipIf(traj_index.XTCTrajectoryFile is None, "mdtraj 未安装")
+    def test_mdtraj_backend_matches_reference(self):
+        coords = self.export('water12.xtc', backend='mdtraj')
+        np.testing.assert_allclose(coords, reference_coords(12), atol=XTC_TOLERANCE, rtol=0)
+
+    def test_stride_time_window_and_selection(self):
+        selection = traj_index.parse_atom_selection('2-3,12', None, None)
+        coords = self.export('water12.xtc', begin=2.0, stride=1, selection=selection, backend='python')
+        expected = reference_coords(12)[1:][:, [1, 2, 11]]
+        np.testing.assert_allclose(coords, expected, atol=XTC_TOLERANCE, rtol=0)
+        np.testing.assert_allclose(np.load(os.path.join(self.tmp, 'water12.xtc.time.npy')), TIMES[1:])
+
+        coords = self.export('water12.trr', stride=2)
+        np.testing.assert_array_equal(coords, reference_coords(12)[::2])
+
+    def test_decode_error_is_reported(self):
+        path = os.path.join(self.tmp, 'bad.xtc')
+        with open(data_path('water12.xtc'), 'rb') as f:
+            content = bytearray(f.read())
+        # 第二帧坐标块的 lsize 与帧头原子数不一致
+        offset = int(traj_index.build_index(data_path('water12.xtc'))['offset'][1])
+        struct.pack_into('>i', content, offset + traj_index.XTC_BASIC_HEADER_SIZE, 11)
+        with open(path, 'wb') as f:
+            f.write(content)
+
+        with self.assertRaisesRegex(ValueError, "XTC 原子数不一致"):
+            traj_index.export_trajectory(path, os.path.join(self.tmp, 'bad'), backend='python')
+        # 失败的导出不留下输出文件
+        self.assertEqual([name for name in os.listdir(self.tmp) if name.startswith('bad.npy')], [])
+
+    def test_selection_out_of_range(self):
+        selection = traj_index.parse_atom_selection('6', None, None)
+        with self.assertRaises(ValueError):
+            self.export('water5.xtc', selection=selection)
+
+
+class CollectTest(unittest.TestCase):
+    """输入展开与输出命名"""
+
+    def test_directory_outputs_mirror_subdirectories(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            for run in ('r1', 'r2'):
+                os.makedirs(os.path.join(tmp, 'runs', run))
+                shutil.copy(data_path('water12.xtc'), os.path.join(tmp, 'runs', run, 'md.xtc'))
+            files = traj_index.collect_trajectories([os.path.join(tmp, 'runs')])
+            stems = traj_index.export_stems(files, 'out')
+            self.assertEqual(stems, [os.path.join('out', 'r1', 'md.xtc'), os.path.join('out', 'r2', 'md.xtc')])
+
+            with self.assertRaises(ValueError):
+                traj_index.export_stems(
+                    traj_index.collect_trajectories([os.path.join(tmp, 'runs', 'r1', 'md.xtc'),
+                                                     os.path.join(tmp, 'runs', 'r2', 'md.xtc')]),
+                    'out')
+
+
+if __name__ == '__main__':
+    unittest.main()
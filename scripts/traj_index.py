@@ -0,0 +1,648 @@
+#!/usr/bin/env python3
+"""
+GROMACS 轨迹索引与子集导出工具
+使用 mmap 扫描 XTC/TRR 帧头，生成紧凑的帧索引（偏移量/时间/原子数），
+并按步长、时间窗口或原子子集将坐标导出为 .npy 文件。
+
+帧布局与扩展中的 XtcStreamReader / TrrStreamReader 保持一致，
+生成的索引偏移量可直接与扩展的流式读取器对应。坐标单位保持 GROMACS 原生的 nm。
+
+依赖: numpy；可选 mdtraj（XTC 解压）
+
+建立索引只读取帧头，速度取决于磁盘。导出 XTC 时需要完整解压每个被选中的帧（原子子集也不例外）：
+安装了 mdtraj 时使用其 C 实现（10⁵ 原子约 5 ms/帧）；否则回退到纯 Python 实现，
+约 0.3–0.6 s/帧，10⁴ 帧的轨迹需要一到两小时单核时间，建议配合 --stride 使用或安装 mdtraj。
+TRR 为未压缩格式，直接通过 mmap 读取，不受影响。
+"""
+
+import os
+import sys
+import mmap
+import struct
+import argparse
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+try:
+    from mdtraj.formats import XTCTrajectoryFile
+except ImportError:
+    XTCTrajectoryFile = None
+
+
+XTC_MAGIC = 1995
+TRR_MAGIC = 1993
+TRAJECTORY_EXTENSIONS = ('.xtc', '.trr')
+INDEX_SUFFIX = '.idx.npy'
+
+# 帧索引的结构化 dtype，每帧 33 字节；time 使用 f8 以保留双精度 TRR 的时间分辨率。
+# has_coords 标记帧中是否包含坐标：nstvout/nstfout 与 nstxout 不同时，
+# TRR 中会出现只有速度或力的帧
+INDEX_DTYPE = np.dtype([
+    ('offset', '<u8'),
+    ('size', '<u4'),
+    ('step', '<i4'),
+    ('time', '<f8'),
+    ('natoms', '<i4'),
+    ('box_offset', '<u4'),
+    ('has_coords', '?'),
+])
+
+# XTC 压缩使用的魔数表（与 xtc/stream-reader.ts 中的 MagicInts 相同）
+MAGIC_INTS = (
+    0, 0, 0, 0, 0, 0, 0, 0, 0, 8, 10, 12, 16, 20, 25, 32, 40, 50, 64,
+    80, 101, 128, 161, 203, 256, 322, 406, 512, 645, 812, 1024, 1290,
+    1625, 2048, 2580, 3250, 4096, 5060, 6501, 8192, 10321, 13003,
+    16384, 20642, 26007, 32768, 41285, 52015, 65536, 82570, 104031,
+    131072, 165140, 208063, 262144, 330280, 416127, 524287, 660561,
+    832255, 1048576, 1321122, 1664510, 2097152, 2642245, 3329021,
+    4194304, 5284491, 6658042, 8388607, 10568983, 13316085, 16777216,
+)
+FIRST_IDX = 9
+
+# XTC 基本帧头: magic + natoms + step + time + box(9) = 52 字节
+XTC_BASIC_HEADER = struct.Struct('>iiif')
+XTC_BASIC_HEADER_SIZE = 52
+# 压缩坐标头: lsize + precision + minint(3) + maxint(3) + smallidx + bytecount
+XTC_COMPRESSED_HEADER = struct.Struct('>if3i3iii')
+
+# TRR 帧头中的 13 个整型字段
+TRR_SIZES = struct.Struct('>13i')
+
+
+def _read_xtc_frame_header(buf, offset: int) -> Tuple[int, int, float, int, int, bool]:
+    """读取 XTC 帧头，返回 (帧大小, 步数, 时间, 原子数, box 偏移, 是否包含坐标)"""
+    magic, natoms, step, time = XTC_BASIC_HEADER.unpack_from(buf, offset)
+    if magic != XTC_MAGIC:
+        raise ValueError(f"无效的 XTC 魔数 {magic}，偏移 {offset}")
+
+    if natoms <= 9:
+        # 未压缩: lsize + 浮点坐标
+        frame_size = XTC_BASIC_HEADER_SIZE + 4 + natoms * 3 * 4
+    else:
+        # 压缩: lsize + precision + minmax(24) + smallidx + bytecount + 数据（按 4 字节对齐）
+        compressed_size = struct.unpack_from('>i', buf, offset + XTC_BASIC_HEADER_SIZE + 36)[0]
+        padded_size = (compressed_size + 3) // 4 * 4
+        frame_size = XTC_BASIC_HEADER_SIZE + 4 + 4 + 24 + 4 + 4 + padded_size
+
+    return frame_size, step, time, natoms, 16, True
+
+
+def _read_trr_frame_header(buf, offset: int) -> Tuple[int, int, float, int, int, bool]:
+    """读取 TRR 帧头，返回 (帧大小, 步数, 时间, 原子数, box 偏移, 是否包含坐标)"""
+    magic, = struct.unpack_from('>i', buf, offset)
+    if magic != TRR_MAGIC:
+        raise ValueError(f"无效的 TRR 魔数 {magic}，偏移 {offset}")
+
+    # 跳过魔数和版本字符串长度字段
+    header_offset = 8
+    version_size, = struct.unpack_from('>i', buf, offset + header_offset)
+    header_offset += 4 + version_size
+
+    (_ir_size, _e_size, box_size, vir_size, pres_size, _top_size, _sym_size,
+     coord_size, velocity_size, force_size, natoms, step, _nre) = \
+        TRR_SIZES.unpack_from(buf, offset + header_offset)
+    header_offset += 52
+
+    float_size = _trr_float_size(box_size, coord_size, velocity_size, force_size, natoms)
+    fmt = '>d' if float_size == 8 else '>f'
+    time, = struct.unpack_from(fmt, buf, offset + header_offset)
+    header_offset += 2 * float_size  # time + lambda
+
+    frame_size = (header_offset + box_size + vir_size + pres_size +
+                  coord_size + velocity_size + force_size)
+
+    return frame_size, step, time, natoms, header_offset, coord_size > 0
+
+
+def _trr_float_size(box_size: int, coord_size: int, velocity_size: int,
+                    force_size: int, natoms: int) -> int:
+    """推断 TRR 的浮点精度，与 GROMACS 相同依次参考 box、坐标、速度和力块的大小"""
+    if box_size:
+        return box_size // 9
+    if natoms:
+        for block_size in (coord_size, velocity_size, force_size):
+            if block_size:
+                return block_size // (natoms * 3)
+    return 4
+
+
+def detect_format(path: str) -> str:
+    """根据扩展名判断轨迹格式"""
+    ext = os.path.splitext(path)[1].lower()
+    if ext not in TRAJECTORY_EXTENSIONS:
+        raise ValueError(f"不支持的轨迹格式: {path}")
+    return ext[1:]
+
+
+def build_index(path: str) -> np.ndarray:
+    """扫描整个轨迹文件，建立帧索引"""
+    fmt = detect_format(path)
+    read_header = _read_xtc_frame_header if fmt == 'xtc' else _read_trr_frame_header
+
+    file_size = os.path.getsize(path)
+    if file_size == 0:
+        return np.zeros(0, dtype=INDEX_DTYPE)
+
+    records: List[Tuple[int, int, int, float, int, int, bool]] = []
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        offset = 0
+        while offset < file_size:
+            try:
+                frame_size, step, time, natoms, box_offset, has_coords = read_header(mm, offset)
+            except (struct.error, ValueError):
+                # 文件结尾或损坏的帧
+                break
+            if offset + frame_size > file_size:
+                # 被截断的最后一帧（例如 mdrun 仍在写入）
+                break
+            records.append((offset, frame_size, step, time, natoms, box_offset, has_coords))
+            offset += frame_size
+
+    return np.array(records, dtype=INDEX_DTYPE)
+
+
+def index_path(path: str) -> str:
+    """轨迹文件对应的索引文件路径"""
+    return path + INDEX_SUFFIX
+
+
+def load_or_build_index(path: str, rebuild: bool = False) -> np.ndarray:
+    """读取已有的索引文件，若不存在或已过期则重新建立"""
+    idx_file = index_path(path)
+    if (not rebuild and os.path.exists(idx_file)
+            and os.path.getmtime(idx_file) >= os.path.getmtime(path)):
+        index = np.load(idx_file)
+        if index.dtype == INDEX_DTYPE:
+            return index
+    return build_index(path)
+
+
+class _BitReader:
+    """XTC 压缩数据的按位读取器（对应 libxdrf 中的 receivebits/receiveints）"""
+
+    def __init__(self, data: bytes):
+        self.data = data
+        self.count = 0
+        self.last_bits = 0
+        self.last_byte = 0
+
+    def bits(self, num_of_bits: int) -> int:
+        mask = (1 << num_of_bits) - 1
+        data = self.data
+        count = self.count
+        last_bits = self.last_bits
+        last_byte = self.last_byte
+        num = 0
+
+        while num_of_bits >= 8:
+            last_byte = ((last_byte << 8) | data[count]) & 0xFFFF
+            count += 1
+            num |= (last_byte >> last_bits) << (num_of_bits - 8)
+            num_of_bits -= 8
+
+        if num_of_bits > 0:
+            if last_bits < num_of_bits:
+                last_bits += 8
+                last_byte = ((last_byte << 8) | data[count]) & 0xFFFF
+                count += 1
+            last_bits -= num_of_bits
+            num |= (last_byte >> last_bits) & ((1 << num_of_bits) - 1)
+
+        self.count = count
+        self.last_bits = last_bits
+        self.last_byte = last_byte
+        return num & mask
+
+    def ints(self, num_of_bits: int, sizes: Tuple[int, int, int]) -> Tuple[int, int, int]:
+        # 逐字节读取（低字节在前），拼成一个大整数后按 sizes 做混合进制拆分
+        value = 0
+        shift = 0
+        while num_of_bits > 8:
+            value |= self.bits(8) << shift
+            shift += 8
+            num_of_bits -= 8
+        if num_of_bits > 0:
+            value |= self.bits(num_of_bits) << shift
+
+        value, z = divmod(value, sizes[2])
+        x, y = divmod(value, sizes[1])
+        return x, y, z
+
+
+def _size_of_int(size: int) -> int:
+    num = 1
+    num_of_bits = 0
+    while size >= num and num_of_bits < 32:
+        num_of_bits += 1
+        num <<= 1
+    return num_of_bits
+
+
+def _decompress_xtc_coords(buf, offset: int, natoms: int) -> np.ndarray:
+    """解压 XTC 坐标，返回 (natoms, 3) 的 float32 数组（单位 nm）"""
+    (lsize, precision, min0, min1, min2, max0, max1, max2,
+     smallidx, byte_count) = XTC_COMPRESSED_HEADER.unpack_from(buf, offset)
+    offset += XTC_COMPRESSED_HEADER.size
+    if lsize != natoms:
+        raise ValueError(f"XTC 原子数不一致: 帧头 {natoms}，坐标块 {lsize}")
+
+    sizeint = (max0 - min0 + 1, max1 - min1 + 1, max2 - min2 + 1)
+    if (sizeint[0] | sizeint[1] | sizeint[2]) > 0xFFFFFF:
+        bitsizeint = tuple(_size_of_int(s) for s in sizeint)
+        bitsize = 0
+    else:
+        bitsizeint = (0, 0, 0)
+        bitsize = (sizeint[0] * sizeint[1] * sizeint[2]).bit_length()
+
+    smaller = MAGIC_INTS[max(FIRST_IDX, smallidx - 1)] // 2
+    smallnum = MAGIC_INTS[smallidx] // 2
+    sizesmall = (MAGIC_INTS[smallidx],) * 3
+
+    reader = _BitReader(bytes(buf[offset:offset + byte_count]))
+    coords = np.empty((lsize, 3), dtype=np.int32)
+    out = 0
+    i = 0
+    run = 0
+
+    while i < lsize:
+        if bitsize == 0:
+            x = reader.bits(bitsizeint[0])
+            y = reader.bits(bitsizeint[1])
+            z = reader.bits(bitsizeint[2])
+        else:
+            x, y, z = reader.ints(bitsize, sizeint)
+        i += 1
+        x += min0
+        y += min1
+        z += min2
+        px, py, pz = x, y, z
+
+        is_smaller = 0
+        if reader.bits(1) == 1:
+            run = reader.bits(5)
+            is_smaller = run % 3
+            run -= is_smaller
+            is_smaller -= 1
+
+        if run > 0:
+            for k in range(0, run, 3):
+                x, y, z = reader.ints(smallidx, sizesmall)
+                i += 1
+                x += px - smallnum
+                y += py - smallnum
+                z += pz - smallnum
+                if k == 0:
+                    # 水分子优化：交换第一个原子与前一个原子的顺序
+                    x, px = px, x
+                    y, py = py, y
+                    z, pz = pz, z
+                    coords[out] = (px, py, pz)
+                    out += 1
+                else:
+                    px, py, pz = x, y, z
+                coords[out] = (x, y, z)
+                out += 1
+        else:
+            coords[out] = (x, y, z)
+            out += 1
+
+        smallidx += is_smaller
+        if is_smaller < 0:
+            smallnum = smaller
+            smaller = MAGIC_INTS[smallidx - 1] // 2 if smallidx > FIRST_IDX else 0
+        elif is_smaller > 0:
+            smaller = smallnum
+            smallnum = MAGIC_INTS[smallidx] // 2
+        sizesmall = (MAGIC_INTS[smallidx],) * 3
+        if sizesmall[0] == 0:
+            raise ValueError("XTC 压缩数据损坏")
+
+    return coords.astype(np.float32) / np.float32(precision)
+
+
+def read_frame(buf, fmt: str, record) -> Tuple[np.ndarray, np.ndarray]:
+    """按索引记录读取一帧，返回 (坐标 (natoms, 3), box (3, 3))，单位 nm
+
+    返回的数组均为副本：出错时异常回溯若仍持有 mmap 上的视图，关闭 mmap 会抛出 BufferError
+    并掩盖原始错误。
+    """
+    offset = int(record['offset'])
+    natoms = int(record['natoms'])
+    box_start = offset + int(record['box_offset'])
+
+    if fmt == 'xtc':
+        box = np.frombuffer(buf, dtype='>f4', count=9, offset=box_start).astype(np.float32).reshape(3, 3)
+        data_start = offset + XTC_BASIC_HEADER_SIZE
+        if natoms <= 9:
+            coords = np.frombuffer(buf, dtype='>f4', count=natoms * 3,
+                                   offset=data_start + 4).astype(np.float32).reshape(natoms, 3)
+        else:
+            coords = _decompress_xtc_coords(buf, data_start, natoms)
+        return coords, box
+
+    # TRR: box/vir/pres 之后紧跟坐标块
+    header_offset = 8
+    version_size, = struct.unpack_from('>i', buf, offset + header_offset)
+    header_offset += 4 + version_size
+    sizes = TRR_SIZES.unpack_from(buf, offset + header_offset)
+    box_size, vir_size, pres_size = sizes[2:5]
+    coord_size, velocity_size, force_size = sizes[7:10]
+    if not coord_size:
+        raise ValueError(f"TRR 帧 (偏移 {offset}) 不包含坐标")
+    float_size = _trr_float_size(box_size, coord_size, velocity_size, force_size, natoms)
+    dtype = '>f8' if float_size == 8 else '>f4'
+
+    box = np.zeros((3, 3), dtype=np.float32)
+    if box_size:
+        box = np.frombuffer(buf, dtype=dtype, count=9, offset=box_start).astype(np.float32).reshape(3, 3)
+    coord_start = box_start + box_size + vir_size + pres_size
+    coords = np.frombuffer(buf, dtype=dtype, count=natoms * 3,
+                           offset=coord_start).astype(np.float32).reshape(natoms, 3)
+    return coords, box
+
+
+def parse_atom_selection(spec: Optional[str], ndx_file: Optional[str],
+                         group: Optional[str]) -> Optional[np.ndarray]:
+    """解析原子子集，返回从 0 开始的原子下标；未指定时返回 None 表示全部原子
+
+    spec 使用 GROMACS 习惯的 1 起始编号，例如 "1-100,250,300-310"；
+    也可通过 NDX 文件与组名选择。
+    """
+    indices: List[int] = []
+
+    if spec:
+        for part in spec.split(','):
+            part = part.strip()
+            if not part:
+                continue
+            if '-' in part:
+                start, end = part.split('-', 1)
+                indices.extend(range(int(start), int(end) + 1))
+            else:
+                indices.append(int(part))
+
+    if ndx_file:
+        if not group:
+            raise ValueError("使用 --ndx 时必须通过 --group 指定组名")
+        groups = read_ndx_groups(ndx_file)
+        if group not in groups:
+            raise ValueError(f"NDX 文件中找不到组 [ {group} ]")
+        indices.extend(groups[group])
+
+    if not indices:
+        return None
+
+    selection = np.asarray(indices, dtype=np.int64) - 1
+    if selection.min() < 0:
+        raise ValueError("原子编号必须从 1 开始")
+    return selection
+
+
+def read_ndx_groups(ndx_file: str) -> Dict[str, List[int]]:
+    """读取 NDX 索引文件中的所有组"""
+    groups: Dict[str, List[int]] = {}
+    current: Optional[List[int]] = None
+    with open(ndx_file, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.split(';', 1)[0].strip()
+            if not line:
+                continue
+            if line.startswith('[') and line.endswith(']'):
+                current = groups.setdefault(line[1:-1].strip(), [])
+            elif current is not None:
+                current.extend(int(tok) for tok in line.split())
+    return groups
+
+
+def select_frames(index: np.ndarray, begin: Optional[float], end: Optional[float],
+                  stride: int) -> np.ndarray:
+    """按时间窗口和步长筛选帧，返回帧号数组
+
+    不包含坐标的帧（TRR 中只有速度或力的帧）不参与筛选，步长按包含坐标的帧计算。
+    """
+    mask = index['has_coords'].copy()
+    if begin is not None:
+        mask &= index['time'] >= begin
+    if end is not None:
+        mask &= index['time'] <= end
+    return np.flatnonzero(mask)[::stride]
+
+
+def resolve_backend(fmt: str, backend: str) -> str:
+    """确定坐标解码方式：XTC 在 auto 模式下优先使用 mdtraj"""
+    if backend == 'mdtraj' and XTCTrajectoryFile is None:
+        raise ValueError("未安装 mdtraj，无法使用 --backend mdtraj")
+    if fmt == 'xtc' and backend in ('auto', 'mdtraj') and XTCTrajectoryFile is not None:
+        return 'mdtraj'
+    return 'python'
+
+
+def export_trajectory(path: str, out_stem: str, begin: Optional[float] = None,
+                      end: Optional[float] = None, stride: int = 1,
+                      selection: Optional[np.ndarray] = None,
+                      rebuild: bool = False, backend: str = 'auto') -> Dict[str, object]:
+    """导出轨迹子集为 <out_stem>.npy、<out_stem>.time.npy 和 <out_stem>.box.npy"""
+    fmt = detect_format(path)
+    index = load_or_build_index(path, rebuild)
+    frame_numbers = select_frames(index, begin, end, stride)
+    frames = index[frame_numbers]
+    backend = resolve_backend(fmt, backend)
+
+    natoms = int(index['natoms'][0]) if len(index) else 0
+    if selection is not None and len(selection) and selection.max() >= natoms:
+        raise ValueError(f"原子编号超出范围（轨迹共 {natoms} 个原子）")
+    n_selected = natoms if selection is None else len(selection)
+
+    stem = out_stem
+    os.makedirs(os.path.dirname(stem) or '.', exist_ok=True)
+    coords_file = stem + '.npy'
+    # 使用 open_memmap 逐帧写入，避免在内存中保存整个子集；
+    # 先写入临时文件，全部帧解码成功后再改名，失败时不会留下看似完整的全零数组
+    partial_file = coords_file + '.part'
+    coords_out = np.lib.format.open_memmap(
+        partial_file, mode='w+', dtype=np.float32, shape=(len(frames), n_selected, 3))
+    boxes = np.empty((len(frames), 3, 3), dtype=np.float32)
+
+    try:
+        if len(frames) and backend == 'mdtraj':
+            with XTCTrajectoryFile(path, 'r') as xtc:
+                for i, frame_number in enumerate(frame_numbers):
+                    xtc.seek(int(frame_number))
+                    coords, _time, _step, box = xtc.read(n_frames=1, atom_indices=selection)
+                    coords_out[i] = coords[0]
+                    boxes[i] = box[0]
+        elif len(frames):
+            with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                for i, record in enumerate(frames):
+                    coords, box = read_frame(mm, fmt, record)
+                    coords_out[i] = coords if selection is None else coords[selection]
+                    boxes[i] = box
+        coords_out.flush()
+    except BaseException:
+        del coords_out
+        os.remove(partial_file)
+        raise
+    del coords_out
+
+    np.save(stem + '.time.npy', frames['time'])
+    np.save(stem + '.box.npy', boxes)
+    os.replace(partial_file, coords_file)
+
+    return {
+        'path': path,
+        'frames': len(frames),
+        'atoms': n_selected,
+        'backend': backend,
+        'output': coords_file,
+    }
+
+
+def index_trajectory(path: str, rebuild: bool = False) -> Dict[str, object]:
+    """为单个轨迹文件建立并保存索引"""
+    index = load_or_build_index(path, rebuild)
+    np.save(index_path(path), index)
+    times = index['time']
+    return {
+        'path': path,
+        'frames': len(index),
+        'atoms': int(index['natoms'][0]) if len(index) else 0,
+        'begin': float(times[0]) if len(index) else 0.0,
+        'end': float(times[-1]) if len(index) else 0.0,
+        'output': index_path(path),
+    }
+
+
+def collect_trajectories(paths: List[str]) -> List[Tuple[str, str]]:
+    """展开输入路径，返回 (轨迹路径, 相对名称) 列表
+
+    目录中的 XTC/TRR 文件会被递归收集，相对名称保留其相对于该目录的子路径
+    （例如 r1/md.xtc），单独给出的文件使用文件名。重复给出的同一文件只保留一次。
+    """
+    files: List[Tuple[str, str]] = []
+    seen = set()
+
+    def add(path: str, name: str):
+        real = os.path.realpath(path)
+        if real not in seen:
+            seen.add(real)
+            files.append((path, name))
+
+    for path in paths:
+        if os.path.isdir(path):
+            for root, dirs, names in os.walk(path):
+                dirs.sort()
+                for name in sorted(names):
+                    if name.lower().endswith(TRAJECTORY_EXTENSIONS):
+                        file_path = os.path.join(root, name)
+                        add(file_path, os.path.relpath(file_path, path))
+        else:
+            add(path, os.path.basename(path))
+    return files
+
+
+def export_stems(files: List[Tuple[str, str]], out_dir: str) -> List[str]:
+    """为每个轨迹确定输出前缀；输出目录中镜像输入的子目录结构，重名时报错"""
+    stems: Dict[str, str] = {}
+    for path, name in files:
+        stem = os.path.normpath(os.path.join(out_dir, name))
+        if stem in stems:
+            raise ValueError(f"输出文件重名: {stems[stem]} 与 {path} 都将写入 {stem}.npy")
+        stems[stem] = path
+    return list(stems)
+
+
+def _run_parallel(func, tasks: List[Tuple[str, Dict[str, object]]], jobs: int) -> int:
+    """使用进程池并行处理多个轨迹文件，tasks 为 (轨迹路径, 关键字参数) 列表，返回失败数量"""
+    failures = 0
+    if jobs <= 1 or len(tasks) <= 1:
+        results = []
+        for path, kwargs in tasks:
+            try:
+                results.append((path, func(path, **kwargs), None))
+            except Exception as e:
+                results.append((path, None, e))
+    else:
+        results = []
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            futures = {pool.submit(func, path, **kwargs): path for path, kwargs in tasks}
+            for future in as_completed(futures):
+                path = futures[future]
+                try:
+                    results.append((path, future.result(), None))
+                except Exception as e:
+                    results.append((path, None, e))
+
+    for path, result, error in results:
+        if error is not None:
+            failures += 1
+            print(f"错误: {path}: {error}", file=sys.stderr)
+            continue
+        line = f"{path}: {result['frames']} 帧, {result['atoms']} 个原子"
+        if 'begin' in result:
+            line += f", 时间 {result['begin']:g} - {result['end']:g} ps"
+        if 'backend' in result:
+            line += f" ({result['backend']})"
+        print(f"{line} -> {result['output']}")
+    return failures
+
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(
+        description="GROMACS XTC/TRR 轨迹索引与子集导出工具")
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument('paths', nargs='+', help="轨迹文件或包含轨迹的目录")
+    common.add_argument('-j', '--jobs', type=int, default=os.cpu_count() or 1,
+                        help="并行处理的进程数（默认: CPU 核心数）")
+    common.add_argument('--rebuild', action='store_true', help="忽略已有索引，重新扫描")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    subparsers.add_parser('index', parents=[common], help="建立帧索引 (<轨迹>.idx.npy)")
+
+    export_parser = subparsers.add_parser('export', parents=[common], help="导出坐标子集为 .npy")
+    export_parser.add_argument('-o', '--out', default='.',
+                               help="输出目录，目录输入的子目录结构会被保留（默认: 当前目录）")
+    export_parser.add_argument('-b', '--begin', type=float, help="起始时间 (ps)")
+    export_parser.add_argument('-e', '--end', type=float, help="结束时间 (ps)")
+    export_parser.add_argument('-s', '--stride', type=int, default=1, help="帧步长（默认: 1）")
+    export_parser.add_argument('-a', '--atoms', help="原子编号（从 1 开始），例如 1-100,250")
+    export_parser.add_argument('-n', '--ndx', help="NDX 索引文件")
+    export_parser.add_argument('-g', '--group', help="NDX 中的组名")
+    export_parser.add_argument('--backend', choices=('auto', 'mdtraj', 'python'), default='auto',
+                               help="XTC 解压方式：auto 在安装了 mdtraj 时使用 mdtraj，否则使用纯 Python（默认: auto）")
+
+    args = parser.parse_args()
+
+    files = collect_trajectories(args.paths)
+    if not files:
+        print("错误: 未找到 XTC/TRR 轨迹文件", file=sys.stderr)
+        sys.exit(1)
+
+    try:
+        if args.command == 'index':
+            tasks = [(path, {'rebuild': args.rebuild}) for path, _name in files]
+            failures = _run_parallel(index_trajectory, tasks, args.jobs)
+        else:
+            if args.stride < 1:
+                raise ValueError("--stride 必须为正整数")
+            selection = parse_atom_selection(args.atoms, args.ndx, args.group)
+            stems = export_stems(files, args.out)
+            tasks = [
+                (path, {'out_stem': stem, 'begin': args.begin, 'end': args.end,
+                        'stride': args.stride, 'selection': selection, 'rebuild': args.rebuild,
+                        'backend': args.backend})
+                for (path, _name), stem in zip(files, stems)
+            ]
+            failures = _run_parallel(export_trajectory, tasks, args.jobs)
+    except (ValueError, OSError) as e:
+        print(f"错误: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
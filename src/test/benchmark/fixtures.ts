@@ -0,0 +1,492 @@
+/**
+ * 基准测试用的合成 GROMACS 文件生成器
+ *
+ * 所有文件都由固定种子的伪随机数生成，同一参数下内容完全一致，
+ * 生成结果缓存在 .bench-cache/ 中，重复运行时直接复用。
+ */
+import * as fs from 'fs';
+import * as path from 'path';
+
+/** 生成器格式版本，修改文件布局时递增以使旧缓存失效 */
+const FIXTURE_VERSION = 1;
+
+/** 与 xtc/stream-reader.ts 中相同的 XTC 压缩魔数表 */
+const MAGIC_INTS = [
+  0, 0, 0, 0, 0, 0, 0, 0, 0, 8, 10, 12, 16, 20, 25, 32, 40, 50, 64,
+  80, 101, 128, 161, 203, 256, 322, 406, 512, 645, 812, 1024, 1290,
+  1625, 2048, 2580, 3250, 4096, 5060, 6501, 8192, 10321, 13003,
+  16384, 20642, 26007, 32768, 41285, 52015, 65536, 82570, 104031,
+  131072, 165140, 208063, 262144, 330280, 416127, 524287, 660561,
+  832255, 1048576, 1321122, 1664510, 2097152, 2642245, 3329021,
+  4194304, 5284491, 6658042, 8388607, 10568983, 13316085, 16777216
+];
+
+/** 小整数编码使用的 smallidx，MAGIC_INTS[24] = 256，可表示 ±128 (0.128 nm) 的相对位移 */
+const SMALL_IDX = 24;
+const XTC_PRECISION = 1000;
+/** 预先编码的不同帧数量，其余帧循环复用并改写 step/time */
+const DISTINCT_FRAMES = 4;
+const TIME_STEP_PS = 10;
+const STEPS_PER_FRAME = 5000;
+
+const RESIDUES = ['ALA', 'GLY', 'LEU', 'LYS', 'GLU', 'SER', 'ASP', 'PHE', 'ARG', 'VAL'];
+const ATOM_NAMES = ['N', 'CA', 'CB', 'C', 'O', 'H'];
+
+/**
+ * 固定种子的伪随机数生成器 (mulberry32)
+ */
+export function createRandom(seed: number): () => number {
+  let state = seed >>> 0;
+  return () => {
+    state = (state + 0x6D2B79F5) >>> 0;
+    let t = state;
+    t = Math.imul(t ^ (t >>> 15), t | 1);
+    t ^= t + Math.imul(t ^ (t >>> 7), t | 61);
+    return ((t ^ (t >>> 14)) >>> 0) / 4294967296;
+  };
+}
+
+/**
+ * 合成体系：三原子一组的水分子式排布，盒子大小按水的数密度 (~100 原子/nm³) 估算
+ */
+interface SyntheticSystem {
+  natoms: number;
+  boxSize: number;
+  frames: Float32Array[];
+}
+
+function buildSystem(natoms: number, seed: number): SyntheticSystem {
+  const random = createRandom(seed);
+  const boxSize = Math.max(3, Math.cbrt(natoms / 100));
+  const base = new Float32Array(natoms * 3);
+
+  for (let i = 0; i < natoms; i += 3) {
+    const ox = random() * boxSize;
+    const oy = random() * boxSize;
+    const oz = random() * boxSize;
+    for (let j = 0; j < 3 && i + j < natoms; j++) {
+      // 同一分子内的原子与第一个原子相距不超过 0.09 nm
+      const offset = j === 0 ? 0 : 0.09;
+      base[(i + j) * 3] = ox + (random() * 2 - 1) * offset;
+      base[(i + j) * 3 + 1] = oy + (random() * 2 - 1) * offset;
+      base[(i + j) * 3 + 2] = oz + (random() * 2 - 1) * offset;
+    }
+  }
+
+  const frames: Float32Array[] = [];
+  for (let f = 0; f < DISTINCT_FRAMES; f++) {
+    const coords = new Float32Array(base);
+    // 按分子整体平移，保持分子内相对位移不变
+    for (let i = 0; i < natoms; i += 3) {
+      const dx = (random() * 2 - 1) * 0.05;
+      const dy = (random() * 2 - 1) * 0.05;
+      const dz = (random() * 2 - 1) * 0.05;
+      for (let j = 0; j < 3 && i + j < natoms; j++) {
+        coords[(i + j) * 3] += dx;
+        coords[(i + j) * 3 + 1] += dy;
+        coords[(i + j) * 3 + 2] += dz;
+      }
+    }
+    frames.push(coords);
+  }
+
+  return { natoms, boxSize, frames };
+}
+
+/**
+ * 按块写入大文件，避免小帧逐个调用 writeSync
+ */
+class ChunkedWriter {
+  private chunks: Buffer[] = [];
+  private pending = 0;
+
+  constructor(private fd: number, private chunkSize: number = 4 * 1024 * 1024) { }
+
+  write(buffer: Buffer): void {
+    this.chunks.push(buffer);
+    this.pending += buffer.length;
+    if (this.pending >= this.chunkSize) {
+      this.flush();
+    }
+  }
+
+  flush(): void {
+    if (this.pending > 0) {
+      fs.writeSync(this.fd, Buffer.concat(this.chunks, this.pending));
+      this.chunks = [];
+      this.pending = 0;
+    }
+  }
+}
+
+/**
+ * 写入到临时文件后再重命名，避免中断的生成留下不完整的缓存
+ */
+function writeFixture(filePath: string, writeContent: (writer: ChunkedWriter) => void): string {
+  if (fs.existsSync(filePath)) {
+    return filePath;
+  }
+
+  fs.mkdirSync(path.dirname(filePath), { recursive: true });
+  const tmpPath = `${filePath}.tmp`;
+  const fd = fs.openSync(tmpPath, 'w');
+  try {
+    const writer = new ChunkedWriter(fd);
+    writeContent(writer);
+    writer.flush();
+  } finally {
+    fs.closeSync(fd);
+  }
+  fs.renameSync(tmpPath, filePath);
+  return filePath;
+}
+
+function writeTextFixture(filePath: string, lines: Iterable<string>): string {
+  return writeFixture(filePath, writer => {
+    let batch: string[] = [];
+    for (const line of lines) {
+      batch.push(line);
+      if (batch.length >= 10000) {
+        writer.write(Buffer.from(batch.join('\n') + '\n'));
+        batch = [];
+      }
+    }
+    if (batch.length > 0) {
+      writer.write(Buffer.from(batch.join('\n') + '\n'));
+    }
+  });
+}
+
+function fixturePath(cacheDir: string, name: string): string {
+  return path.join(cacheDir, `v${FIXTURE_VERSION}`, name);
+}
+
+/**
+ * XTC 压缩数据的按位写入器（与 libxdrf 中的 sendbits/sendints 对应）
+ */
+class BitWriter {
+  private bytes: number[] = [];
+  private current = 0;
+  private currentBits = 0;
+
+  sendBits(numOfBits: number, value: number): void {
+    for (let b = numOfBits - 1; b >= 0; b--) {
+      this.current = (this.current << 1) | ((value >>> b) & 1);
+      this.currentBits++;
+      if (this.currentBits === 8) {
+        this.bytes.push(this.current);
+        this.current = 0;
+        this.currentBits = 0;
+      }
+    }
+  }
+
+  /**
+   * 将三个整数按 sizes 组合为混合进制大整数，低字节在前写出
+   */
+  sendInts(numOfBits: number, sizes: number[], nums: number[]): void {
+    let value = (BigInt(nums[0]) * BigInt(sizes[1]) + BigInt(nums[1])) * BigInt(sizes[2]) + BigInt(nums[2]);
+    while (numOfBits > 8) {
+      this.sendBits(8, Number(value & 0xFFn));
+      value >>= 8n;
+      numOfBits -= 8;
+    }
+    if (numOfBits > 0) {
+      this.sendBits(numOfBits, Number(value));
+    }
+  }
+
+  toBuffer(): Buffer {
+    const bytes = this.currentBits > 0
+      ? [...this.bytes, this.current << (8 - this.currentBits)]
+      : this.bytes;
+    return Buffer.from(bytes);
+  }
+}
+
+/**
+ * 编码单个 XTC 帧
+ *
+ * 每个三原子分子的第二个原子作为大整数写出，第一和第三个原子作为小整数游程写出，
+ * 对应解码器中交换前两个原子的水分子优化；剩余原子以 run = 0 单独写出。
+ */
+function encodeXtcFrame(coords: Float32Array, natoms: number, boxSize: number): Buffer {
+  if (natoms <= 9) {
+    // 9 个原子以下的帧不压缩，读取器按浮点数组处理
+    throw new Error('Synthetic XTC frames require more than 9 atoms');
+  }
+  const ints = new Int32Array(natoms * 3);
+  const minInt = [Infinity, Infinity, Infinity];
+  const maxInt = [-Infinity, -Infinity, -Infinity];
+  for (let i = 0; i < natoms * 3; i++) {
+    const value = Math.round(coords[i] * XTC_PRECISION);
+    ints[i] = value;
+    minInt[i % 3] = Math.min(minInt[i % 3], value);
+    maxInt[i % 3] = Math.max(maxInt[i % 3], value);
+  }
+
+  const sizeInt = [0, 1, 2].map(k => maxInt[k] - minInt[k] + 1);
+  if ((sizeInt[0] | sizeInt[1] | sizeInt[2]) > 0xffffff) {
+    throw new Error('Synthetic XTC box too large for packed integer encoding');
+  }
+  const product = BigInt(sizeInt[0]) * BigInt(sizeInt[1]) * BigInt(sizeInt[2]);
+  const bitSize = product.toString(2).length;
+
+  const smallNum = MAGIC_INTS[SMALL_IDX] / 2;
+  const sizeSmall = [MAGIC_INTS[SMALL_IDX], MAGIC_INTS[SMALL_IDX], MAGIC_INTS[SMALL_IDX]];
+  const atom = (i: number) => [ints[i * 3], ints[i * 3 + 1], ints[i * 3 + 2]];
+  const writer = new BitWriter();
+
+  let i = 0;
+  while (i < natoms) {
+    if (i + 2 < natoms) {
+      const first = atom(i);
+      const second = atom(i + 1);
+      const third = atom(i + 2);
+      writer.sendInts(bitSize, sizeInt, second.map((v, k) => v - minInt[k]));
+      // flag = 1, run = 6 (两个小整数原子), is_smaller = 0
+      writer.sendBits(1, 1);
+      writer.sendBits(5, 6 + 1);
+      writer.sendInts(SMALL_IDX, sizeSmall, first.map((v, k) => v - second[k] + smallNum));
+      writer.sendInts(SMALL_IDX, sizeSmall, third.map((v, k) => v - first[k] + smallNum));
+      i += 3;
+    } else {
+      writer.sendInts(bitSize, sizeInt, atom(i).map((v, k) => v - minInt[k]));
+      writer.sendBits(1, 1);
+      writer.sendBits(5, 0 + 1);
+      i += 1;
+    }
+  }
+
+  const data = writer.toBuffer();
+  const paddedSize = Math.ceil(data.length / 4) * 4;
+  const frame = Buffer.alloc(52 + 40 + paddedSize);
+  let offset = 0;
+  offset = frame.writeInt32BE(1995, offset);
+  offset = frame.writeInt32BE(natoms, offset);
+  offset = frame.writeInt32BE(0, offset);       // step，写入时改写
+  offset = frame.writeFloatBE(0, offset);       // time，写入时改写
+  for (let k = 0; k < 9; k++) {
+    offset = frame.writeFloatBE(k % 4 === 0 ? boxSize : 0, offset);
+  }
+  offset = frame.writeInt32BE(natoms, offset);
+  offset = frame.writeFloatBE(XTC_PRECISION, offset);
+  for (const value of [...minInt, ...maxInt]) {
+    offset = frame.writeInt32BE(value, offset);
+  }
+  offset = frame.writeInt32BE(SMALL_IDX, offset);
+  offset = frame.writeInt32BE(data.length, offset);
+  data.copy(frame, offset);
+  return frame;
+}
+
+/**
+ * 编码单个单精度 TRR 帧（仅包含 box 和坐标）
+ */
+function encodeTrrFrame(coords: Float32Array, natoms: number, boxSize: number): Buffer {
+  const version = 'GMX_trn_file';
+  const headerSize = 8 + 4 + version.length + 52 + 8;
+  const frame = Buffer.alloc(headerSize + 36 + natoms * 12);
+  let offset = 0;
+  offset = frame.writeInt32BE(1993, offset);
+  offset = frame.writeInt32BE(version.length + 1, offset);
+  offset = frame.writeInt32BE(version.length, offset);
+  offset += frame.write(version, offset, 'ascii');
+  // ir, e, box, vir, pres, top, sym, x, v, f, natoms, step, nre
+  const sizes = [0, 0, 36, 0, 0, 0, 0, natoms * 12, 0, 0, natoms, 0, 0];
+  for (const value of sizes) {
+    offset = frame.writeInt32BE(value, offset);
+  }
+  offset = frame.writeFloatBE(0, offset);       // time，写入时改写
+  offset = frame.writeFloatBE(0, offset);       // lambda
+  for (let k = 0; k < 9; k++) {
+    offset = frame.writeFloatBE(k % 4 === 0 ? boxSize : 0, offset);
+  }
+  for (let i = 0; i < natoms * 3; i++) {
+    offset = frame.writeFloatBE(coords[i], offset);
+  }
+  return frame;
+}
+
+/**
+ * 生成合成 XTC 轨迹
+ */
+export function generateXtc(cacheDir: string, natoms: number, nframes: number): string {
+  const filePath = fixturePath(cacheDir, `traj_${natoms}x${nframes}.xtc`);
+  return writeFixture(filePath, writer => {
+    const system = buildSystem(natoms, natoms);
+    const encoded = system.frames.map(coords => encodeXtcFrame(coords, natoms, system.boxSize));
+    for (let f = 0; f < nframes; f++) {
+      const frame = Buffer.from(encoded[f % encoded.length]);
+      frame.writeInt32BE(f * STEPS_PER_FRAME, 8);
+      frame.writeFloatBE(f * TIME_STEP_PS, 12);
+      writer.write(frame);
+    }
+  });
+}
+
+/**
+ * 生成合成 TRR 轨迹
+ */
+export function generateTrr(cacheDir: string, natoms: number, nframes: number): string {
+  const filePath = fixturePath(cacheDir, `traj_${natoms}x${nframes}.trr`);
+  return writeFixture(filePath, writer => {
+    const system = buildSystem(natoms, natoms);
+    const encoded = system.frames.map(coords => encodeTrrFrame(coords, natoms, system.boxSize));
+    // step 位于 13 个整型字段中的第 12 个，time 紧随其后
+    const stepOffset = 8 + 4 + 12 + 44;
+    for (let f = 0; f < nframes; f++) {
+      const frame = Buffer.from(encoded[f % encoded.length]);
+      frame.writeInt32BE(f * STEPS_PER_FRAME, stepOffset);
+      frame.writeFloatBE(f * TIME_STEP_PS, stepOffset + 8);
+      writer.write(frame);
+    }
+  });
+}
+
+/**
+ * 生成 gmx energy 风格的多列 XVG 文件
+ */
+export function generateXvg(cacheDir: string, rows: number, columns: number): string {
+  const filePath = fixturePath(cacheDir, `energy_${rows}x${columns}.xvg`);
+  return writeTextFixture(filePath, (function* () {
+    const random = createRandom(rows + columns);
+    yield '# This file was created by the benchmark fixture generator';
+    yield '# Created by: gmx energy';
+    yield '@ title "GROMACS Energies"';
+    yield '@ xaxis  label "Time (ps)"';
+    yield '@ yaxis  label "(kJ/mol)"';
+    yield '@TYPE xy';
+    for (let c = 0; c < columns; c++) {
+      yield `@ s${c} legend "Term ${c}"`;
+    }
+    const values = new Array(columns).fill(0).map(() => -1e5 * random());
+    for (let r = 0; r < rows; r++) {
+      let line = (r * 2).toFixed(4).padStart(12);
+      for (let c = 0; c < columns; c++) {
+        values[c] += random() * 20 - 10;
+        line += values[c].toFixed(3).padStart(16);
+      }
+      yield line;
+    }
+  })());
+}
+
+/**
+ * 生成 GRO 结构文件（蛋白残基 + 水）
+ */
+export function generateGro(cacheDir: string, natoms: number): string {
+  const filePath = fixturePath(cacheDir, `conf_${natoms}.gro`);
+  return writeTextFixture(filePath, (function* () {
+    const system = buildSystem(natoms, natoms);
+    const coords = system.frames[0];
+    const proteinAtoms = Math.floor(natoms / 10);
+    yield 'Synthetic benchmark system';
+    yield String(natoms).padStart(5);
+    for (let i = 0; i < natoms; i++) {
+      const isProtein = i < proteinAtoms;
+      const resNum = isProtein ? Math.floor(i / ATOM_NAMES.length) + 1 : Math.floor((i - proteinAtoms) / 3) + 1;
+      const resName = isProtein ? RESIDUES[(resNum - 1) % RESIDUES.length] : 'SOL';
+      const atomName = isProtein ? ATOM_NAMES[i % ATOM_NAMES.length] : ['OW', 'HW1', 'HW2'][(i - proteinAtoms) % 3];
+      yield String(resNum % 100000).padStart(5) +
+        resName.padEnd(5) +
+        atomName.padStart(5) +
+        String((i + 1) % 100000).padStart(5) +
+        coords[i * 3].toFixed(3).padStart(8) +
+        coords[i * 3 + 1].toFixed(3).padStart(8) +
+        coords[i * 3 + 2].toFixed(3).padStart(8);
+    }
+    const box = system.boxSize.toFixed(5).padStart(10);
+    yield `${box}${box}${box}`;
+  })());
+}
+
+/**
+ * 生成 PDB 结构文件（坐标单位 Å）
+ */
+export function generatePdb(cacheDir: string, natoms: number): string {
+  const filePath = fixturePath(cacheDir, `conf_${natoms}.pdb`);
+  return writeTextFixture(filePath, (function* () {
+    const system = buildSystem(natoms, natoms);
+    const coords = system.frames[0];
+    const proteinAtoms = Math.floor(natoms / 10);
+    const box = (system.boxSize * 10).toFixed(3).padStart(9);
+    yield 'HEADER    SYNTHETIC BENCHMARK SYSTEM';
+    yield 'REMARK   1 GENERATED FOR PERFORMANCE TESTS';
+    yield `CRYST1${box}${box}${box}  90.00  90.00  90.00 P 1           1`;
+    for (let i = 0; i < natoms; i++) {
+      const isProtein = i < proteinAtoms;
+      const resNum = isProtein ? Math.floor(i / ATOM_NAMES.length) + 1 : Math.floor((i - proteinAtoms) / 3) + 1;
+      const resName = isProtein ? RESIDUES[(resNum - 1) % RESIDUES.length] : 'SOL';
+      const atomName = isProtein ? ATOM_NAMES[i % ATOM_NAMES.length] : ['OW', 'HW1', 'HW2'][(i - proteinAtoms) % 3];
+      const element = atomName[0];
+      yield (isProtein ? 'ATOM  ' : 'HETATM') +
+        String((i + 1) % 100000).padStart(5) + ' ' +
+        (atomName.length < 4 ? ' ' + atomName : atomName).padEnd(4) + ' ' +
+        resName.padStart(3) + ' ' +
+        (isProtein ? 'A' : 'W') +
+        String(resNum % 10000).padStart(4) + '    ' +
+        (coords[i * 3] * 10).toFixed(3).padStart(8) +
+        (coords[i * 3 + 1] * 10).toFixed(3).padStart(8) +
+        (coords[i * 3 + 2] * 10).toFixed(3).padStart(8) +
+        '  1.00  0.00' + ' '.repeat(10) + element.padStart(2);
+    }
+    yield 'END';
+  })());
+}
+
+/**
+ * 生成 gmx make_ndx 风格的索引文件（每行 15 个编号）
+ */
+export function generateNdx(cacheDir: string, natoms: number, groups: number): string {
+  const filePath = fixturePath(cacheDir, `index_${natoms}x${groups}.ndx`);
+  return writeTextFixture(filePath, (function* () {
+    const random = createRandom(natoms + groups);
+    for (let g = 0; g < groups; g++) {
+      yield g === 0 ? '[ System ]' : `[ Group_${g} ]`;
+      // 第一个组包含全部原子，其余组为随机连续区间
+      const start = g === 0 ? 1 : 1 + Math.floor(random() * natoms / 2);
+      const count = g === 0 ? natoms : Math.max(1, Math.floor(random() * natoms / groups));
+      const end = Math.min(natoms, start + count - 1);
+      let line: string[] = [];
+      for (let atom = start; atom <= end; atom++) {
+        line.push(String(atom).padStart(4));
+        if (line.length === 15) {
+          yield line.join(' ');
+          line = [];
+        }
+      }
+      if (line.length > 0) {
+        yield line.join(' ');
+      }
+      yield '';
+    }
+  })());
+}
+
+/**
+ * 生成 mdrun md.log 风格的长日志，末尾附带剩余时间行
+ */
+export function generateMdrunLog(cacheDir: string, blocks: number): string {
+  const filePath = fixturePath(cacheDir, `md_${blocks}.log`);
+  return writeTextFixture(filePath, (function* () {
+    const random = createRandom(blocks);
+    yield '                      :-) GROMACS - gmx mdrun, 2024.1 (-:';
+    yield '';
+    yield 'Started mdrun on rank 0';
+    yield '';
+    for (let b = 0; b < blocks; b++) {
+      const step = (b + 1) * STEPS_PER_FRAME;
+      yield '           Step           Time';
+      yield `${String(step).padStart(15)}${(step * 0.002).toFixed(5).padStart(15)}`;
+      yield '';
+      yield '   Energies (kJ/mol)';
+      yield '          Angle    Proper Dih.  Improper Dih.          LJ-14     Coulomb-14';
+      yield [0, 1, 2, 3, 4].map(() => (random() * 1e5).toExponential(5).padStart(15)).join('');
+      yield '        LJ (SR)   Coulomb (SR)   Coul. recip.      Potential    Kinetic En.';
+      yield [0, 1, 2, 3, 4].map(() => (-random() * 1e6).toExponential(5).padStart(15)).join('');
+      yield '';
+    }
+    yield `step ${blocks * STEPS_PER_FRAME}, remaining wall clock time:   210 s`;
+  })());
+}
@@ -0,0 +1,260 @@
+/**
+ * 基准测试计时、内存采样与基线比较
+ *
+ * 运行: npm run bench（需要 VS Code 测试环境，合成文件首次运行时生成到 .bench-cache/）
+ *
+ * 环境变量:
+ * - GROMACS_BENCH_PROFILE: quick（默认）或 full
+ * - GROMACS_BENCH_TOLERANCE: 允许的退化比例，默认 0.25（即 25%）
+ * - GROMACS_BENCH_UPDATE_BASELINE: 设为 1 时用本次结果覆盖基线
+ * - GROMACS_BENCH_BASELINE_DIR: 基线目录，默认 src/test/benchmark/baselines
+ * - GROMACS_BENCH_CACHE_DIR: 合成文件缓存目录，默认 .bench-cache
+ *
+ * 基线按平台和架构分文件保存，CPU 型号或 Node 版本与基线不一致时跳过比较，
+ * 因为绝对耗时只在同一台机器上可比。CI 中在同一 runner 上先为目标分支生成基线，再运行 PR 分支进行比较。
+ */
+import * as fs from 'fs';
+import * as os from 'os';
+import * as path from 'path';
+import * as v8 from 'v8';
+import * as vm from 'vm';
+
+export type BenchmarkProfile = 'quick' | 'full';
+
+export interface BenchmarkResult {
+  name: string;
+  iterations: number;
+  medianMs: number;
+  minMs: number;
+  maxMs: number;
+  /** 运行期间 heapUsed + external 相对运行前的峰值增量（见 measure） */
+  peakMemoryBytes: number;
+}
+
+export interface BenchmarkReport {
+  suite: string;
+  profile: BenchmarkProfile;
+  createdAt: string;
+  environment: {
+    node: string;
+    platform: string;
+    arch: string;
+    cpu: string;
+    totalMemoryBytes: number;
+    /** 峰值内存的测量方式 */
+    memoryProbe: 'gc-profiler' | 'sampling';
+  };
+  results: Record<string, BenchmarkResult>;
+  /** 套件结束时进程生命周期内的最大常驻内存，只增不减，因此按套件而非按用例记录，仅供参考 */
+  maxRssBytes: number;
+}
+
+/** 仓库根目录（编译后位于 out/test/benchmark） */
+export const REPO_ROOT = path.join(__dirname, '..', '..', '..');
+export const CACHE_DIR = process.env.GROMACS_BENCH_CACHE_DIR || path.join(REPO_ROOT, '.bench-cache');
+export const RESULTS_DIR = path.join(REPO_ROOT, '.bench-results');
+export const BASELINE_DIR = process.env.GROMACS_BENCH_BASELINE_DIR ||
+  path.join(REPO_ROOT, 'src', 'test', 'benchmark', 'baselines');
+
+export const PROFILE: BenchmarkProfile = process.env.GROMACS_BENCH_PROFILE === 'full' ? 'full' : 'quick';
+const TOLERANCE = parseFloat(process.env.GROMACS_BENCH_TOLERANCE || '0.25');
+const UPDATE_BASELINE = process.env.GROMACS_BENCH_UPDATE_BASELINE === '1';
+const MEMORY_SAMPLE_INTERVAL_MS = 5;
+/** 低于该值的耗时增加不视为退化：quick 配置中的毫秒级用例在共享 runner 上的波动远超容差比例 */
+const MIN_TIME_REGRESSION_MS = 10;
+/** 低于该值的峰值内存增加不视为退化 */
+const MIN_MEMORY_REGRESSION_BYTES = 1024 * 1024;
+
+/**
+ * 尝试获取 gc 函数，使内存测量不受上一轮垃圾的影响
+ */
+function resolveGc(): (() => void) | undefined {
+  const globalGc = (globalThis as { gc?: () => void }).gc;
+  if (globalGc) {
+    return globalGc;
+  }
+  try {
+    v8.setFlagsFromString('--expose-gc');
+    return vm.runInNewContext('gc') as () => void;
+  } catch {
+    return undefined;
+  }
+}
+
+const collectGarbage = resolveGc();
+
+interface GcProfilerLike {
+  start(): void;
+  stop(): { statistics: { beforeGC: { heapStatistics: { usedHeapSize: number; externalMemory: number } } }[] } | undefined;
+}
+
+/** v8.GCProfiler（Node 18.15+）记录运行期间每次 GC 前的堆使用量，同步代码中也能得到峰值 */
+const GcProfiler = (v8 as unknown as { GCProfiler?: new () => GcProfilerLike }).GCProfiler;
+const MEMORY_PROBE: BenchmarkReport['environment']['memoryProbe'] = GcProfiler ? 'gc-profiler' : 'sampling';
+
+function currentMemory(): number {
+  const usage = process.memoryUsage();
+  return usage.heapUsed + usage.external;
+}
+
+/**
+ * 运行 fn 若干次，记录耗时中位数与峰值内存
+ *
+ * 峰值内存取以下各点的最大值：运行期间每次 GC 前的堆使用量（GCProfiler）、
+ * 异步等待期间的定时采样，以及操作结束时（结果仍被引用）的内存。
+ * GCProfiler 不可用时只剩后两者，同步操作中的临时峰值会被遗漏。
+ */
+export async function measure(
+  name: string,
+  fn: () => unknown,
+  iterations: number
+): Promise<BenchmarkResult> {
+  const timings: number[] = [];
+  let peakMemoryBytes = 0;
+
+  for (let i = 0; i < iterations; i++) {
+    collectGarbage?.();
+    const before = currentMemory();
+    let peak = before;
+    const profiler = GcProfiler ? new GcProfiler() : undefined;
+    profiler?.start();
+    const sampler = setInterval(() => {
+      peak = Math.max(peak, currentMemory());
+    }, MEMORY_SAMPLE_INTERVAL_MS);
+
+    const start = process.hrtime.bigint();
+    let result: unknown;
+    try {
+      result = await fn();
+    } finally {
+      clearInterval(sampler);
+    }
+    const elapsedMs = Number(process.hrtime.bigint() - start) / 1e6;
+
+    for (const gc of profiler?.stop()?.statistics ?? []) {
+      const stats = gc.beforeGC.heapStatistics;
+      peak = Math.max(peak, stats.usedHeapSize + stats.externalMemory);
+    }
+    peak = Math.max(peak, currentMemory());
+    timings.push(elapsedMs);
+    peakMemoryBytes = Math.max(peakMemoryBytes, peak - before);
+    // 采样完成后再释放结果，保证返回值计入峰值内存
+    result = undefined;
+  }
+
+  const sorted = [...timings].sort((a, b) => a - b);
+  return {
+    name,
+    iterations,
+    medianMs: sorted[Math.floor(sorted.length / 2)],
+    minMs: sorted[0],
+    maxMs: sorted[sorted.length - 1],
+    peakMemoryBytes
+  };
+}
+
+/**
+ * 收集一个套件的结果，写入 .bench-results/ 并与基线比较
+ */
+export class BenchmarkRecorder {
+  private results: Record<string, BenchmarkResult> = {};
+
+  constructor(private suite: string) { }
+
+  record(result: BenchmarkResult): void {
+    this.results[result.name] = result;
+    console.log(
+      `[bench] ${result.name}: median ${result.medianMs.toFixed(2)} ms, ` +
+      `peak ${(result.peakMemoryBytes / 1024 / 1024).toFixed(1)} MB`
+    );
+  }
+
+  /**
+   * 保存结果并返回相对基线的退化列表；没有同 profile、同平台的基线时返回空列表
+   */
+  finish(): string[] {
+    const report: BenchmarkReport = {
+      suite: this.suite,
+      profile: PROFILE,
+      createdAt: new Date().toISOString(),
+      environment: {
+        node: process.version,
+        platform: process.platform,
+        arch: process.arch,
+        cpu: os.cpus()[0]?.model ?? 'unknown',
+        totalMemoryBytes: os.totalmem(),
+        memoryProbe: MEMORY_PROBE
+      },
+      results: this.results,
+      maxRssBytes: process.resourceUsage().maxRSS * 1024
+    };
+
+    const fileName = `${this.suite}.${PROFILE}.${process.platform}-${process.arch}.json`;
+    fs.mkdirSync(RESULTS_DIR, { recursive: true });
+    fs.writeFileSync(path.join(RESULTS_DIR, fileName), JSON.stringify(report, null, 2));
+
+    const baselinePath = path.join(BASELINE_DIR, fileName);
+    if (UPDATE_BASELINE) {
+      fs.mkdirSync(BASELINE_DIR, { recursive: true });
+      fs.writeFileSync(baselinePath, JSON.stringify(report, null, 2) + '\n');
+      console.log(`[bench] Baseline updated: ${baselinePath}`);
+      return [];
+    }
+    if (!fs.existsSync(baselinePath)) {
+      console.log(`[bench] No baseline at ${baselinePath}, skipping comparison`);
+      return [];
+    }
+
+    const baseline: BenchmarkReport = JSON.parse(fs.readFileSync(baselinePath, 'utf-8'));
+    const mismatches = environmentMismatches(baseline, report);
+    if (mismatches.length > 0) {
+      console.warn(`[bench] Baseline environment differs (${mismatches.join('; ')}), skipping comparison`);
+      return [];
+    }
+    return compareReports(baseline, report, TOLERANCE);
+  }
+}
+
+/**
+ * 列出基线与本次运行环境中影响可比性的差异
+ */
+export function environmentMismatches(baseline: BenchmarkReport, current: BenchmarkReport): string[] {
+  const keys: (keyof BenchmarkReport['environment'])[] = ['platform', 'arch', 'cpu', 'node', 'memoryProbe'];
+  return keys
+    .filter(key => baseline.environment?.[key] !== current.environment[key])
+    .map(key => `${key}: ${baseline.environment?.[key]} -> ${current.environment[key]}`);
+}
+
+/**
+ * 比较耗时中位数和峰值内存，同时超出容差比例和绝对下限的项目视为退化
+ *
+ * 调用前应先用 environmentMismatches 确认两份报告来自同一环境。
+ */
+export function compareReports(baseline: BenchmarkReport, current: BenchmarkReport, tolerance: number): string[] {
+  const regressions: string[] = [];
+
+  for (const [name, result] of Object.entries(current.results)) {
+    const reference = baseline.results[name];
+    if (!reference) {
+      continue;
+    }
+    const timeLimit = Math.max(reference.medianMs * (1 + tolerance), reference.medianMs + MIN_TIME_REGRESSION_MS);
+    if (result.medianMs > timeLimit) {
+      regressions.push(
+        `${name}: median ${result.medianMs.toFixed(2)} ms vs baseline ${reference.medianMs.toFixed(2)} ms`
+      );
+    }
+    const memoryLimit = Math.max(
+      reference.peakMemoryBytes * (1 + tolerance),
+      reference.peakMemoryBytes + MIN_MEMORY_REGRESSION_BYTES
+    );
+    if (result.peakMemoryBytes > memoryLimit) {
+      regressions.push(
+        `${name}: peak memory ${(result.peakMemoryBytes / 1024 / 1024).toFixed(1)} MB ` +
+        `vs baseline ${(reference.peakMemoryBytes / 1024 / 1024).toFixed(1)} MB`
+      );
+    }
+  }
+
+  return regressions;
+}
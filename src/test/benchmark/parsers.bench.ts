@@ -0,0 +1,97 @@
+import * as assert from 'assert';
+import * as fs from 'fs';
+import * as vscode from 'vscode';
+import { XvgPreviewProvider } from '../../providers/xvgPreviewProvider';
+import { NdxSymbolProvider } from '../../providers/ndxSymbolProvider';
+import { GroSemanticTokensProvider } from '../../providers/groSemanticTokensProvider';
+import { PdbSemanticTokensProvider } from '../../providers/pdbSemanticTokensProvider';
+import { LocalMonitor } from '../../providers/gromacsMonitorProvider';
+import { generateGro, generateMdrunLog, generateNdx, generatePdb, generateXvg } from './fixtures';
+import { BenchmarkRecorder, CACHE_DIR, PROFILE, measure } from './harness';
+
+/**
+ * 文本文件大小保持在 50 MB 以下，超过该大小 VS Code 不会将文档同步给扩展
+ */
+const SIZES = PROFILE === 'full'
+  ? { xvgRows: 500000, xvgColumns: 4, structureAtoms: 500000, ndxAtoms: 1000000, ndxGroups: 20, logBlocks: 100000 }
+  : { xvgRows: 100000, xvgColumns: 4, structureAtoms: 10000, ndxAtoms: 100000, ndxGroups: 10, logBlocks: 10000 };
+const ITERATIONS = PROFILE === 'full' ? 3 : 5;
+
+suite('Parser Benchmarks', function () {
+  this.timeout(0);
+  const recorder = new BenchmarkRecorder('parsers');
+  const token = new vscode.CancellationTokenSource().token;
+
+  /**
+   * 预先打开文档，使计时只包含解析本身
+   */
+  async function openFixture(filePath: string): Promise<vscode.TextDocument> {
+    return vscode.workspace.openTextDocument(vscode.Uri.file(filePath));
+  }
+
+  suiteTeardown(() => {
+    const regressions = recorder.finish();
+    assert.deepStrictEqual(regressions, [], `Performance regressions:\n${regressions.join('\n')}`);
+  });
+
+  test('XVG parse', async () => {
+    const { xvgRows, xvgColumns } = SIZES;
+    const document = await openFixture(generateXvg(CACHE_DIR, xvgRows, xvgColumns));
+    const provider = new XvgPreviewProvider({} as vscode.ExtensionContext);
+
+    recorder.record(await measure(`xvg ${xvgRows}x${xvgColumns} / parse`, async () => {
+      const data = await provider['parseXvgFile'](document.uri);
+      assert.strictEqual(data.series.length, xvgColumns);
+      assert.strictEqual(data.series[0].data.length, xvgRows);
+      return data;
+    }, ITERATIONS));
+  });
+
+  test('NDX document symbols', async () => {
+    const { ndxAtoms, ndxGroups } = SIZES;
+    const document = await openFixture(generateNdx(CACHE_DIR, ndxAtoms, ndxGroups));
+    const provider = new NdxSymbolProvider();
+
+    recorder.record(await measure(`ndx ${ndxAtoms}x${ndxGroups} / symbols`, () => {
+      const symbols = provider.provideDocumentSymbols(document, token) as vscode.DocumentSymbol[];
+      assert.strictEqual(symbols.length, ndxGroups);
+      return symbols;
+    }, ITERATIONS));
+  });
+
+  test('GRO semantic tokens', async () => {
+    const { structureAtoms } = SIZES;
+    const document = await openFixture(generateGro(CACHE_DIR, structureAtoms));
+    const provider = new GroSemanticTokensProvider();
+
+    recorder.record(await measure(`gro ${structureAtoms} / tokenize`, () => {
+      const tokens = provider.provideDocumentSemanticTokens(document, token) as vscode.SemanticTokens;
+      assert.ok(tokens.data.length > 0);
+      return tokens;
+    }, ITERATIONS));
+  });
+
+  test('PDB semantic tokens', async () => {
+    const { structureAtoms } = SIZES;
+    const document = await openFixture(generatePdb(CACHE_DIR, structureAtoms));
+    const provider = new PdbSemanticTokensProvider();
+
+    recorder.record(await measure(`pdb ${structureAtoms} / tokenize`, () => {
+      const tokens = provider.provideDocumentSemanticTokens(document, token) as vscode.SemanticTokens;
+      assert.ok(tokens.data.length > 0);
+      return tokens;
+    }, ITERATIONS));
+  });
+
+  test('mdrun log parse', async () => {
+    const { logBlocks } = SIZES;
+    const content = fs.readFileSync(generateMdrunLog(CACHE_DIR, logBlocks), 'utf-8');
+    const monitor = new LocalMonitor({ id: 'bench', name: 'bench', type: 'local', independent: false });
+
+    recorder.record(await measure(`log ${logBlocks} blocks / parse`, () => {
+      const parsed = monitor['parseLogContent'](content);
+      assert.strictEqual(parsed.remainingTime, 210);
+      return parsed;
+    }, ITERATIONS));
+  });
+});
@@ -0,0 +1,68 @@
+import * as assert from 'assert';
+import * as vscode from 'vscode';
+import { XtcStreamReader } from '../../util/xtc/stream-reader';
+import { TrrStreamReader } from '../../util/trr/stream-reader';
+import { StreamingReader } from '../../util/stream-reader';
+import { generateTrr, generateXtc } from './fixtures';
+import { BenchmarkRecorder, CACHE_DIR, PROFILE, measure } from './harness';
+
+/** [原子数, 帧数]，full 覆盖 10³–10⁶ 原子、10²–10⁵ 帧，单个 TRR 约 1.2 GB */
+const TRAJECTORY_CASES: [number, number][] = PROFILE === 'full'
+  ? [[1000, 100000], [10000, 10000], [100000, 1000], [1000000, 100]]
+  : [[1000, 1000], [10000, 100]];
+const ITERATIONS = PROFILE === 'full' ? 3 : 5;
+/** 每次解码测试读取的帧数（均匀分布在整个轨迹上） */
+const DECODE_FRAMES = 20;
+
+type ReaderFactory = (uri: vscode.Uri) => StreamingReader;
+
+const FORMATS: { name: string; generate: typeof generateXtc; createReader: ReaderFactory }[] = [
+  { name: 'xtc', generate: generateXtc, createReader: uri => new XtcStreamReader(uri, 1) },
+  { name: 'trr', generate: generateTrr, createReader: uri => new TrrStreamReader(uri, 1) }
+];
+
+suite('Trajectory Reader Benchmarks', function () {
+  this.timeout(0);
+  const recorder = new BenchmarkRecorder('readers');
+
+  suiteTeardown(() => {
+    const regressions = recorder.finish();
+    assert.deepStrictEqual(regressions, [], `Performance regressions:\n${regressions.join('\n')}`);
+  });
+
+  for (const format of FORMATS) {
+    for (const [natoms, nframes] of TRAJECTORY_CASES) {
+      const label = `${format.name} ${natoms}x${nframes}`;
+
+      test(`${label}: index and decode`, async () => {
+        const uri = vscode.Uri.file(format.generate(CACHE_DIR, natoms, nframes));
+
+        recorder.record(await measure(`${label} / index`, async () => {
+          const reader = format.createReader(uri);
+          await reader.initialize();
+          const info = await reader.getInfo();
+          await reader.close();
+          assert.strictEqual(info.frameCount, nframes);
+          assert.strictEqual(info.atomCount, natoms);
+          return info;
+        }, ITERATIONS));
+
+        // 解码时不计入索引开销，缓存大小为 1 保证每帧都从文件读取
+        const reader = format.createReader(uri);
+        await reader.initialize();
+        const step = Math.max(1, Math.floor(nframes / DECODE_FRAMES));
+        const frameNumbers = Array.from({ length: Math.min(DECODE_FRAMES, nframes) }, (_, i) => i * step);
+
+        try {
+          recorder.record(await measure(`${label} / decode ${frameNumbers.length} frames`, async () => {
+            const frames = await reader.getFrames(frameNumbers);
+            assert.strictEqual(frames[frames.length - 1].count, natoms);
+            return frames;
+          }, ITERATIONS));
+        } finally {
+          await reader.close();
+        }
+      });
+    }
+  }
+});